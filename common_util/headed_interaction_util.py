@@ -1,14 +1,58 @@
+import gzip
+import json
+import random
+import string
 import time
 import os
+import threading
 import traceback
 from venv import logger
-import requests
+from urllib.parse import urljoin, urlsplit
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import MemoryHandler, RotatingFileHandler
 
 import schedule
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+# Tokens identifying verification controls in their text/attributes, and the selector for the controls they are matched against.
+# Phrases are matched as substrings, single words only as whole words (so 'age' matches "Age check" but not "Next page").
+_VERIFY_PHRASES = ("i am not a robot", "i'm not a robot", "not a robot", "i am not a bot", "i'm not a bot", "over 18", "18+")
+_VERIFY_WORDS = frozenset(("verify", "confirm", "continue", "agree", "accept", "proceed", "age", "cookie", "submit"))
+_PUNCTUATION_TO_SPACE = str.maketrans({c: ' ' for c in string.punctuation if c != '_'})
+# Substrings of an .age-gate-buttons button's text that mark the "yes, I am 18 or older" answer, and a pattern (JS regex
+# source) for the negative answers to never click, such as "No" or "I am under 18"
+_AGE_YES_TOKENS = ("yes", "18 or older", "over 18")
+_AGE_NO_PATTERN = r"under|^no\b"
+# Age-gate controls in the order they are tried: a selector, the tokens a match's text must contain one of (none: any
+# match), and a pattern that rules a match out (None: nothing is ruled out)
+_AGE_CLICK_RULES = (
+    ("#age-button-yes", (), None),
+    (".age-gate-buttons button", _AGE_YES_TOKENS, _AGE_NO_PATTERN),
+)
+# Dataset file links (.item-list) and pagination links make up most anchors on DOJ list pages and are never verification
+# controls, so they are excluded by the browser's selector engine instead of being scanned.
+_CANDIDATE_SEL = "button, a:not(.item-list a):not(.usa-pagination a), input[type=button], input[type=submit], input[type=checkbox], label"
+# Explicit bot verification challenge ("I am not a robot" button / reauth() trigger)
+_ROBOT_SEL = "input[type=button][value*='robot'], button[value*='robot'], input[onclick*='reauth'], [onclick*='reauth']"
+# Elements that appear once the age/bot verification has been passed
+_VERIFIED_SEL = "#ageSuccess, .item-list, .views-field"
+# Resource types that DOJ pages can be scraped without
+_BLOCKED_RESOURCE_TYPES = frozenset(("image", "media", "font"))
+# Elements that embed or link a PDF. The ' i' flags make the attribute tests case-insensitive, so links ending in
+# .PDF are found by the same query rather than by a second pass over every anchor.
+_PDF_SEL = "embed[type='application/pdf' i], object[type='application/pdf' i], iframe[src$='.pdf' i], a[href$='.pdf' i]"
+# How long a verification click gets to start a navigation before it is treated as a non-navigating click
+_CLICK_NAVIGATION_TIMEOUT_MS = 2000
 
 logger = None # Global logger instance - initialized via configure_logging
+_log_lock = threading.Lock() # Guards logger initialization when files are pulled from worker threads
+
+
+def _matches_verification_text(text: str) -> bool:
+    text_lc = text.lower()
+    if any(phrase in text_lc for phrase in _VERIFY_PHRASES):
+        return True
+    return not _VERIFY_WORDS.isdisjoint(text_lc.translate(_PUNCTUATION_TO_SPACE).split())
 
 ############################################################
 # START - Playwright Scheduled Cleanup for Memory Management
@@ -38,20 +82,44 @@ def print_request_details(request):
         print("---------------")
 
 
-def _log_debug(msg: str, run_dir: str, verbose: bool = True, exception: Exception = None):
+def block_heavy_resources(context):
+    """Abort image, media and font requests for every page of `context`.
+
+    Only the DOM and the file links are needed from DOJ pages. Stylesheets, scripts and XHRs are kept: the age gate is
+    driven by script, and the verification checks read computed visibility.
+    """
+    def _route(route):
+        if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+            route.abort()
+        else:
+            route.continue_()
+    context.route("**/*", _route)
+
+
+def _log_debug(msg: str, run_dir: str, verbose: bool = True, *args, exception: Exception = None):
+    """Log `msg` to stdout and verbose_log.txt when `verbose` is set.
+
+    Extra positional `args` are %-formatted into `msg` only when the message is actually logged, so hot call sites
+    can pass them instead of building an f-string that non-verbose runs throw away.
+    """
     global logger
     if not verbose:
         return
+    if args:
+        msg = msg % args
     try:
         print(f"[DEBUG] {msg}")
     except Exception:
         pass
     try:
         if logger is None:
-            logger = configure_logging(run_dir, 'verbose_log.txt')
-        logger.info(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - {msg}")
+            with _log_lock:
+                if logger is None:
+                    logger = configure_logging(run_dir, 'verbose_log.txt')
+        logger.info(msg)
         if exception is not None:
-            logger.info(f"Exception occurred: {exception}\n{traceback.format_exc()}")
+            # Logged at ERROR so the buffered handler flushes it, with everything before it, straight away
+            logger.error(f"Exception occurred: {exception}\n{traceback.format_exc()}")
     except Exception as e:
         print(f"[ERROR] Failed to write to verbose log: {e}")
         pass
@@ -68,20 +136,31 @@ def configure_logging(run_dir: str, log_file_name):
         maxBytes=1024*5000, 
         backupCount=2)
     log_handler.setLevel(logging.INFO)
+    # The formatter stamps each record with its time, so _log_debug doesn't build the timestamp into the message
+    log_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
+
+    # Buffer records and write them in batches instead of flushing the file on every line.
+    # ERROR records (the exceptions passed to _log_debug) flush the buffer immediately, and logging's own atexit
+    # shutdown flushes whatever is left.
+    buffered_handler = MemoryHandler(capacity=50, flushLevel=logging.ERROR, target=log_handler)
 
     # Add the handler to the logger
-    logger.addHandler(log_handler)
+    logger.addHandler(buffered_handler)
     return logger
 
-def save_snapshot(page, run_dir: str, file_basename: str, event: str, ts: str = None):
+def save_snapshot(page, run_dir: str, file_basename: str, event: str, ts: str = None, verbose: bool = False):
+    # Serializing the DOM is expensive on large pages, so snapshots are only taken for verbose runs
+    if not verbose:
+        return None
     ts = ts or time.strftime("%Y%m%d_%H%M%S")
-    snap_path = os.path.join(run_dir, f"{ts}_playwright_snapshot_{file_basename}_{event}.html")
+    snap_path = os.path.join(run_dir, f"{ts}_playwright_snapshot_{file_basename}_{event}.html.gz")
     try:
-        with open(snap_path, 'w', encoding='utf-8') as sf:
+        # Fastest gzip level: snapshots are several MB of repetitive markup and compress well even at level 1
+        with gzip.open(snap_path, 'wt', encoding='utf-8', compresslevel=1) as sf:
             sf.write(page.content())
-        _log_debug(f"Saved snapshot for event '{event}' at {snap_path}", run_dir, verbose=True)
+        _log_debug(f"Saved snapshot for event '{event}' at {snap_path}", run_dir, verbose)
     except Exception:
-        _log_debug(f"Failed to save snapshot for event '{event}' at {snap_path}", run_dir, verbose=True)
+        _log_debug(f"Failed to save snapshot for event '{event}' at {snap_path}", run_dir, verbose)
         pass
     return snap_path
 
@@ -92,114 +171,217 @@ class TryGetRequestException(Exception):
 
 
 def _try_get_request(page, url, run_dir, verbose, desc='', timeout_ms: int = 30000):
-    _log_debug(f"Attempting Playwright request for {desc} URL: {url}", run_dir, verbose=verbose)
+    _log_debug("Attempting Playwright request for %s URL: %s", run_dir, verbose, desc, url)
     result = page.request.get(url, timeout=timeout_ms)
     if result.status != 200:
-        _log_debug(f"Non-200 response for {desc} URL {url}: {result.status}", run_dir=run_dir, verbose=verbose)
+        _log_debug("Non-200 response for %s URL %s: %s", run_dir, verbose, desc, url, result.status)
         raise TryGetRequestException(f"Non-200 response for {desc} URL {url}: {result.status}", response=result)
     return result
 
+def _file_logger(name: str, path: str, fmt: str = '%(message)s'):
+    """Return a logger that appends its records to `path`, opening the file once on first use instead of per record.
+
+    The handler's own lock serializes writes from the download pool's worker threads.
+    """
+    file_logger = logging.getLogger(name)
+    if not file_logger.handlers:
+        with _log_lock:
+            if not file_logger.handlers:
+                handler = logging.FileHandler(path, encoding='utf-8', delay=True)
+                handler.setFormatter(logging.Formatter(fmt, datefmt='%Y-%m-%d %H:%M:%S'))
+                file_logger.addHandler(handler)
+                file_logger.setLevel(logging.INFO)
+                file_logger.propagate = False
+    return file_logger
+
 def _append_dead_letter(file_url: str, run_dir: str):
     try:
         dl_path = os.path.join(os.path.dirname(run_dir), 'dead_letter.txt')
-        with open(dl_path, 'a', encoding='utf-8') as dlf:
-            dlf.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - {file_url}\n")
+        _file_logger('dead_letter', dl_path, '%(asctime)s - %(message)s').info(file_url)
         _log_debug(f"Appended to dead letter: {file_url}", run_dir, verbose=True)
     except Exception as e:
         _log_debug(f"Failed to append to dead letter for {file_url}.", run_dir, verbose=True, exception=e)
         pass
 
-def find_pdf_url(page):
-    # Look for common PDF-containing elements
+def _append_failure_diagnostics(file_url: str, run_dir: str, errors: list, exception: Exception = None):
+    """Write one JSON line describing every failed attempt for `file_url` to failure_diagnostics.jsonl in `run_dir`."""
     try:
-        sel = page.query_selector("embed[type='application/pdf'], object[type='application/pdf'], iframe[src$='.pdf'], a[href$='.pdf']")
-        if sel:
-            for attr in ('src', 'data', 'href'):
-                try:
-                    val = sel.get_attribute(attr)
-                    if val and '.pdf' in val:
-                        return page.url if val.strip().startswith('data:') else requests.compat.urljoin(page.url, val)
-                except Exception:
-                    continue
-    except Exception:
+        record = {
+            'ts': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'url': file_url,
+            'errors': errors,
+            'last_status': next((err.get('status') for err in reversed(errors) if err.get('status') is not None), None),
+        }
+        if exception is not None:
+            record['exception'] = repr(exception)
+            record['traceback'] = ''.join(traceback.format_exception(type(exception), exception, exception.__traceback__))
+        _file_logger('failure_diagnostics', os.path.join(run_dir, 'failure_diagnostics.jsonl')).info(json.dumps(record))
+    except Exception as e:
+        _log_debug(f"Failed to write failure diagnostics for {file_url}.", run_dir, verbose=True, exception=e)
         pass
 
+def find_pdf_url(page):
+    # Read the page URL once; a navigation mid-scan ends the scan anyway, so it can't go stale while in use
+    base_url = page.url
+    # One pass over every PDF-bearing element, reading src/data/href in the browser and returning the first PDF link
     try:
-        links = page.query_selector_all('a')
-        for a in links:
-            try:
-                href = a.get_attribute('href') or ''
-                if href and href.lower().endswith('.pdf'):
-                    return requests.compat.urljoin(page.url, href)
-            except Exception:
-                pass
+        val = page.eval_on_selector_all(_PDF_SEL, """els => {
+            for (const el of els) {
+                const v = ['src', 'data', 'href'].map(a => el.getAttribute(a)).find(v => v && v.toLowerCase().includes('.pdf'));
+                if (v) return v;
+            }
+            return null;
+        }""")
+        if val:
+            return base_url if val.strip().startswith('data:') else urljoin(base_url, val)
     except Exception:
         pass
 
     return None
 
 
-def click_verification_controls(page_obj, run_dir: str, file_basename: str, verbose: bool = False, timeout_ms: int = 10000):
-    _log_debug("Scanning for verification controls to click", run_dir, verbose)
-    import re
-    pattern = re.compile(r"(?i)\b(i am not a robot|i'm not a robot|not a robot|i am not a bot|i'm not a bot|verify|confirm|continue|agree|accept|proceed|over 18|18\+|age|cookie|submit)\b")
+def _time_left_ms(timeout_ms: int, deadline: float = None) -> int:
+    """Return `timeout_ms` cut down to what is left before `deadline` (a `time.monotonic()` value), if one is given."""
+    if deadline is None:
+        return timeout_ms
+    return max(0, min(timeout_ms, int((deadline - time.monotonic()) * 1000)))
 
-    def _check_and_click(el, frame):
+
+def _wait_for_verification_signal(frame, timeout_ms: int, selector: str = None, deadline: float = None):
+    # Wait for the element a verification step is expected to reveal rather than for networkidle, which analytics-heavy
+    # DOJ pages rarely reach; fall back to DOMContentLoaded if it never shows up. Both waits share what is left before
+    # `deadline`; with nothing left, there is no wait at all (a Playwright timeout of 0 would mean no timeout).
+    wait_ms = _time_left_ms(timeout_ms, deadline)
+    if wait_ms <= 0:
+        return
+    try:
+        frame.wait_for_selector(selector or _VERIFIED_SEL, timeout=wait_ms, state='visible')
+    except Exception:
+        wait_ms = _time_left_ms(timeout_ms, deadline)
+        if wait_ms <= 0:
+            return
         try:
-            text = (el.inner_text() or '').strip()
+            frame.wait_for_load_state('domcontentloaded', timeout=wait_ms)
         except Exception:
-            text = ''
-        attrs = []
-        for a in ('aria-label', 'title', 'alt', 'value', 'id', 'name'):
-            try:
-                v = el.get_attribute(a) or ''
-                attrs.append(v)
-            except Exception:
-                pass
-        full = ' '.join([text] + attrs)
-        if pattern.search(full):
+            pass
+
+
+def _scannable_frames(page_obj):
+    # Child frames that can host DOJ's verification controls: same-origin or blank ones. Cross-origin (ad/analytics)
+    # frames are skipped instead of being queried, and the main frame is left out since callers scan it first.
+    page_host = urlsplit(page_obj.url).netloc
+    main_frame = page_obj.main_frame
+    frames = []
+    for f in page_obj.frames:
+        frame_url = f.url
+        if f != main_frame and (not frame_url or frame_url == 'about:blank' or urlsplit(frame_url).netloc == page_host):
+            frames.append(f)
+    return frames
+
+
+def _click_and_settle(frame, el, check: bool = False):
+    # Most verification clicks (checkbox ticks, agree/age buttons) don't navigate. Give the click a short window to start
+    # a navigation and only wait for it if it does, instead of always waiting out a load-state timeout afterwards.
+    try:
+        with frame.expect_navigation(wait_until='domcontentloaded', timeout=_CLICK_NAVIGATION_TIMEOUT_MS):
             try:
-                t = el.get_attribute('type') or ''
-                if t.lower() == 'checkbox':
-                    try:
-                        el.check()
-                    except Exception:
-                        el.click()
+                if check:
+                    el.check()
                 else:
                     el.click()
-                frame.wait_for_load_state('networkidle', timeout=timeout_ms)
-                tsc = time.strftime("%Y%m%d_%H%M%S")
-                snap_path = save_snapshot(frame, run_dir, file_basename, 'bot_click', ts=tsc)
-                _log_debug(f"Clicked verification control; saved snapshot {snap_path}", run_dir, verbose)
+            except Exception:
+                frame.evaluate('el => el.click()', el)
+    except PlaywrightTimeoutError:
+        pass
+
+
+# Browser-side twin of _matches_verification_text: returns the control's text and attributes if they match, else null
+_MATCH_CONTROL_TEXT_JS = r"""(e, phrases, words) => {
+    const attrs = ['aria-label', 'title', 'alt', 'value', 'id', 'name'].map(a => e.getAttribute(a) || '');
+    const text = [(e.innerText || '').trim()].concat(attrs).join(' ');
+    const textLc = text.toLowerCase();
+    const textWords = textLc.replace(/[!-\/:-@\[-\^`{-~]/g, ' ').split(/\s+/);
+    return (phrases.some(p => textLc.includes(p)) || textWords.some(w => words.includes(w))) ? text : null;
+}"""
+
+
+def _match_args():
+    return {'sel': _CANDIDATE_SEL, 'phrases': list(_VERIFY_PHRASES), 'words': list(_VERIFY_WORDS)}
+
+
+def click_verification_controls(page_obj, run_dir: str, file_basename: str, verbose: bool = False, timeout_ms: int = 10000, post_click_selector: str = None, deadline: float = None):
+    _log_debug("Scanning for verification controls to click", run_dir, verbose)
+
+    def _check_and_click(frame):
+        # Match the verification tokens in the browser and only return the matching candidates (in document order),
+        # each tagged with a stable index to click by. Mirrors _matches_verification_text, which re-checks the result.
+        candidates = frame.evaluate("""({sel, phrases, words}) => {
+            const matchText = """ + _MATCH_CONTROL_TEXT_JS + """;
+            // Clear tags left by an earlier scan, so an index can only ever point at this scan's element
+            document.querySelectorAll('[data-hiu-idx]').forEach(e => e.removeAttribute('data-hiu-idx'));
+            const matches = [];
+            document.querySelectorAll(sel).forEach((e, i) => {
+                const text = matchText(e, phrases, words);
+                if (text !== null) {
+                    e.setAttribute('data-hiu-idx', i);
+                    matches.push({i: i, type: e.getAttribute('type') || '', text: text});
+                }
+            });
+            return matches;
+        }""", _match_args())
+        _log_debug("Found %d matching candidate controls in frame", run_dir, verbose, len(candidates))
+        for cand in candidates:
+            if not _matches_verification_text(cand['text']):
+                continue
+            try:
+                el = frame.query_selector(f'[data-hiu-idx="{cand["i"]}"]')
+                if not el:
+                    continue
+                _click_and_settle(frame, el, check=cand['type'].lower() == 'checkbox')
+                if post_click_selector:
+                    _wait_for_verification_signal(frame, timeout_ms, post_click_selector, deadline=deadline)
+                snap_path = save_snapshot(frame, run_dir, file_basename, 'bot_click', verbose=verbose)
+                _log_debug("Clicked verification control; saved snapshot %s", run_dir, verbose, snap_path)
                 return True
             except Exception as e:
                 _log_debug(f"Exception while clicking verification control. ", run_dir, verbose, exception=e)
-                return False
         return False
 
     # Check main frame
     try:
-        candidates = page_obj.query_selector_all("button, a, input[type=button], input[type=submit], input[type=checkbox], label")
-        _log_debug(f"Found {len(candidates)} candidate controls in main frame", run_dir, verbose)
-        for el in candidates:
-            if _check_and_click(el, page_obj):
-                _log_debug("Clicked a control in main frame", run_dir, verbose)
-                return True
+        if _check_and_click(page_obj):
+            _log_debug("Clicked a control in main frame", run_dir, verbose)
+            return True
     except Exception as e:
         _log_debug(f"Error scanning main frame for controls.", run_dir, verbose, exception=e)
 
-    # Check nested frames
+    # Check nested frames. One evaluate walks every same-origin child frame from the main frame and reports which ones
+    # hold a matching control, so only those are scanned (usually none) instead of querying each frame in turn.
     try:
-        frames = page_obj.frames
-        _log_debug(f"Found {len(frames)} frames to scan", run_dir, verbose)
+        hit_urls = set(page_obj.evaluate("""({sel, phrases, words}) => {
+            const matchText = """ + _MATCH_CONTROL_TEXT_JS + """;
+            const hits = [];
+            const walk = (win) => {
+                for (let i = 0; i < win.frames.length; i++) {
+                    try {
+                        const child = win.frames[i];
+                        if (Array.from(child.document.querySelectorAll(sel)).some(e => matchText(e, phrases, words) !== null)) {
+                            hits.push(child.location.href);
+                        }
+                        walk(child);
+                    } catch (e) { /* cross-origin frame, not accessible */ }
+                }
+            };
+            walk(window);
+            return hits;
+        }""", _match_args()))
+        frames = [f for f in _scannable_frames(page_obj) if (f.url or 'about:blank') in hit_urls]
+        _log_debug("Found %d frames to scan", run_dir, verbose, len(frames))
         for f in frames:
             try:
-                cands = f.query_selector_all("button, a, input[type=button], input[type=submit], input[type=checkbox], label")
-                _log_debug(f"Found {len(cands)} candidate controls in a frame", run_dir, verbose)
-                for el in cands:
-                    if _check_and_click(el, f):
-                        _log_debug("Clicked a control in a nested frame", run_dir, verbose)
-                        return True
+                if _check_and_click(f):
+                    _log_debug("Clicked a control in a nested frame", run_dir, verbose)
+                    return True
             except Exception as e:
                 _log_debug(f"Error scanning a nested frame.", run_dir, verbose, exception=e)
     except Exception as e:
@@ -208,109 +390,102 @@ def click_verification_controls(page_obj, run_dir: str, file_basename: str, verb
     return False
 
 
-def click_age_buttons(page_obj, run_dir: str, file_basename: str, verbose: bool = False, timeout_ms: int = 10000):
+def click_age_buttons(page_obj, run_dir: str, file_basename: str, verbose: bool = False, timeout_ms: int = 10000, deadline: float = None):
     try:
-        btn = page_obj.query_selector('#age-button-yes')
+        # Apply _AGE_CLICK_RULES in the browser and get back a handle to the first matching control, if any
+        btn = page_obj.evaluate_handle("""(rules) => {
+            for (const [sel, tokens, reject] of rules) {
+                const rejectRe = reject ? new RegExp(reject) : null;
+                for (const el of document.querySelectorAll(sel)) {
+                    const txt = (el.innerText || '').trim().toLowerCase();
+                    if (rejectRe && rejectRe.test(txt)) continue;
+                    if (!tokens.length || tokens.some(t => txt.includes(t))) return el;
+                }
+            }
+            return null;
+        }""", [[sel, list(tokens), reject] for sel, tokens, reject in _AGE_CLICK_RULES]).as_element()
         if btn:
-            _log_debug('Found #age-button-yes, attempting click', run_dir, verbose)
-            try:
-                btn.click()
-            except Exception:
-                page_obj.evaluate('el => el.click()', btn)
-            page_obj.wait_for_load_state('networkidle', timeout=timeout_ms)
+            _log_debug('Found age-gate control, attempting click', run_dir, verbose)
+            _click_and_settle(page_obj, btn)
             return True
     except Exception as e:
-        _log_debug(f'Exception clicking #age-button-yes.', run_dir, verbose, exception=e)
+        _log_debug(f'Exception scanning for age-gate controls.', run_dir, verbose, exception=e)
 
     try:
-        group = page_obj.query_selector('.age-gate-buttons')
-        if group:
-            btns = group.query_selector_all('button')
-            for b in btns:
-                try:
-                    txt = (b.inner_text() or '').strip().lower()
-                except Exception:
-                    txt = ''
-                if txt in ('yes', 'i am 18 or older', 'i am over 18') or 'yes' in txt:
-                    _log_debug(f'Clicking age-gate button with text: {txt}', run_dir, verbose)
-                    try:
-                        b.click()
-                    except Exception:
-                        page_obj.evaluate('el => el.click()', b)
-                    page_obj.wait_for_load_state('networkidle', timeout=timeout_ms)
-                    return True
-    except Exception as e:
-        _log_debug(f'Exception scanning .age-gate-buttons.', run_dir, verbose, exception=e)
-
-    try:
-        for f in page_obj.frames:
-            try:
-                btn = f.query_selector('#age-button-yes')
-                if btn:
-                    _log_debug('Found #age-button-yes in frame, attempting click', run_dir, verbose)
-                    try:
-                        btn.click()
-                    except Exception:
-                        f.evaluate('el => el.click()', btn)
-                    f.wait_for_load_state('networkidle', timeout=timeout_ms)
-                    return True
-            except Exception:
-                pass
+        # Search all same-origin child frames for the age button and click it in one round-trip instead of querying each frame
+        clicked = page_obj.evaluate("""() => {
+            const search = (win) => {
+                for (let i = 0; i < win.frames.length; i++) {
+                    try {
+                        const btn = win.frames[i].document.querySelector('#age-button-yes');
+                        if (btn) { btn.click(); return true; }
+                        if (search(win.frames[i])) return true;
+                    } catch (e) { /* cross-origin frame, not accessible */ }
+                }
+                return false;
+            };
+            return search(window);
+        }""")
+        if clicked:
+            _log_debug('Clicked #age-button-yes in a child frame', run_dir, verbose)
+            _wait_for_verification_signal(page_obj, timeout_ms, deadline=deadline)
+            return True
     except Exception as e:
         _log_debug(f'Error checking frames for age button.', run_dir, verbose, exception=e)
 
     return False
 
 
-def ensure_page_verified(page, run_dir: str, file_basename: str, verbose: bool = False, timeout_ms: int = 10000, max_attempts: int = 3):
+def ensure_page_verified(page, run_dir: str, file_basename: str, verbose: bool = False, timeout_ms: int = 10000, max_attempts: int = 3, deadline: float = None):
     """Ensure DOJ site age/bot verification steps are completed for the given page.
 
     - Checks for known verification cookie or absence of the age-verify block.
     - Attempts clicking verification controls and age buttons across frames with retries.
     - Saves snapshots for each attempt.
+    - With a `deadline` (a `time.monotonic()` value), every wait takes from the time left and no attempt starts after it.
 
     Returns True if verification is detected or successful, False otherwise.
     """
+    probe = {}  # Markers from the last DOM probe in _is_verified, reused by the robot-button step of the same attempt
     def _is_verified():
+        probe.clear()
         try:
-            # Check cookie
-            cookies = page.evaluate("() => document.cookie") or ''
-            if 'justiceGovAgeVerified' in cookies:
-                return True
-        except Exception:
-            pass
-        try:
-            # Check for age success element
-            el = page.query_selector('#ageSuccess')
-            if el:
-                display = page.evaluate("el => window.getComputedStyle(el).display", el)
-                if display and display != 'none':
+            # Check cookie (parsed by the browser context, no script evaluation needed)
+            for cookie in page.context.cookies(page.url):
+                if cookie['name'] == 'justiceGovAgeVerified':
                     return True
         except Exception:
             pass
         try:
-            # Detect explicit bot verification challenge elements (do not treat as verified)
-            robot_btn = page.query_selector("input[type=button][value*='robot'], button[value*='robot'], input[onclick*='reauth'], [onclick*='reauth']")
-            if robot_btn:
-                return False
+            # Probe every verification marker in a single round-trip
+            state = page.evaluate("""(robotSel) => {
+                const ageSuccess = document.querySelector('#ageSuccess');
+                const ageBlock = document.querySelector('#age-verify-block');
+                return {
+                    ageSuccessDisplay: ageSuccess ? window.getComputedStyle(ageSuccess).display : null,
+                    robot: !!document.querySelector(robotSel),
+                    hasAgeBlock: !!ageBlock,
+                    ageBlockDisplay: ageBlock ? window.getComputedStyle(ageBlock).display : null,
+                    datasetList: !!document.querySelector('.item-list, .views-field, .item-list ul'),
+                };
+            }""", _ROBOT_SEL)
         except Exception:
-            pass
-        try:
-            # If the age block isn't present, we can't assume verified — check for dataset markers instead
-            age_block = page.query_selector('#age-verify-block')
-            if not age_block:
-                # If the page contains the expected dataset list, consider it verified
-                list_el = page.query_selector('.item-list, .views-field, .item-list ul')
-                if list_el:
-                    return True
-                # Otherwise, unknown; conservatively treat as not verified so ensure_page_verified will attempt fixes
-                return False
-            # If present but hidden
-            display = page.evaluate("el => window.getComputedStyle(el).display", age_block)
-            if display and display == 'none':
-                return True
-        except Exception:
-            pass
+            return False
+        probe.update(state)
+        # Check for age success element
+        if state['ageSuccessDisplay'] and state['ageSuccessDisplay'] != 'none':
+            return True
+        # Detect explicit bot verification challenge elements (do not treat as verified)
+        if state['robot']:
+            return False
+        # If the age block isn't present, we can't assume verified — check for dataset markers instead
+        if not state['hasAgeBlock']:
+            # If the page contains the expected dataset list, consider it verified
+            # Otherwise, unknown; conservatively treat as not verified so ensure_page_verified will attempt fixes
+            return state['datasetList']
+        # If present but hidden
+        if state['ageBlockDisplay'] == 'none':
+            return True
         return False
 
     if _is_verified():
@@ -318,49 +493,63 @@ def ensure_page_verified(page, run_dir: str, file_basename: str, verbose: bool =
         return True
 
     for attempt in range(1, max_attempts + 1):
-        _log_debug(f'Verification attempt {attempt} on page', run_dir, verbose)
-        clicked = click_verification_controls(page, run_dir, file_basename, verbose, timeout_ms)
+        if deadline is not None and time.monotonic() >= deadline:
+            _log_debug('No time left for verification attempt %d', run_dir, verbose, attempt)
+            break
+        _log_debug('Verification attempt %d on page', run_dir, verbose, attempt)
+        # Wait for the verified-page markers after a click, so the _is_verified() check below sees the settled page
+        clicked = click_verification_controls(page, run_dir, file_basename, verbose, timeout_ms, post_click_selector=_VERIFIED_SEL, deadline=deadline)
         if clicked:
-            save_snapshot(page, run_dir, file_basename, f'verify_clicked_{attempt}')
+            save_snapshot(page, run_dir, file_basename, f'verify_clicked_{attempt}', verbose=verbose)
+            if _is_verified():
+                _log_debug('Page verification succeeded after clicking verification controls', run_dir, verbose)
+                return True
         # Explicitly try clicking an "I am not a robot" input/button and call reauth() if present
+        robot_handled = False
         try:
-            robot_btn = page.query_selector("input[type=button][value*='robot'], button[value*='robot'], input[onclick*='reauth'], [onclick*='reauth']")
+            # After a click, the _is_verified() probe above already looked at the settled page, so only query when it
+            # saw a robot button (or couldn't tell, e.g. when it returned early). Without a click the last probe may
+            # predate script-inserted controls, so always query.
+            robot_btn = page.query_selector(_ROBOT_SEL) if not clicked or probe.get('robot', True) else None
             if robot_btn:
                 _log_debug('Found robot verification button; attempting click', run_dir, verbose)
                 try:
                     robot_btn.click()
                 except Exception:
                     page.evaluate('el => el.click()', robot_btn)
-                save_snapshot(page, run_dir, file_basename, f'robot_clicked_{attempt}')
-                try:
-                    page.wait_for_load_state('networkidle', timeout=timeout_ms)
-                except Exception:
-                    pass
+                save_snapshot(page, run_dir, file_basename, f'robot_clicked_{attempt}', verbose=verbose)
+                robot_handled = True
+                _wait_for_verification_signal(page, timeout_ms, deadline=deadline)
             # If a reauth function exists on the page, call it directly as a fallback
             try:
                 called = page.evaluate("() => { if (typeof reauth === 'function') { try { reauth(); return true; } catch(e){ return 'error'; } } return false }")
                 if called:
                     _log_debug('Called reauth() on page', run_dir, verbose)
-                    save_snapshot(page, run_dir, file_basename, f'reauth_called_{attempt}')
-                    try:
-                        page.wait_for_load_state('networkidle', timeout=timeout_ms)
-                    except Exception:
-                        pass
+                    save_snapshot(page, run_dir, file_basename, f'reauth_called_{attempt}', verbose=verbose)
+                    robot_handled = True
+                    _wait_for_verification_signal(page, timeout_ms, deadline=deadline)
             except Exception as e:
                 _log_debug(f'Exception invoking reauth().', run_dir, verbose, exception=e)
         except Exception as e:
             _log_debug(f'Exception handling robot button/reauth.', run_dir, verbose, exception=e)
+        if robot_handled and _is_verified():
+            _log_debug('Page verification succeeded after robot button/reauth', run_dir, verbose)
+            return True
 
-        age_clicked = click_age_buttons(page, run_dir, file_basename, verbose, timeout_ms)
+        age_clicked = click_age_buttons(page, run_dir, file_basename, verbose, timeout_ms, deadline=deadline)
         if age_clicked:
-            save_snapshot(page, run_dir, file_basename, f'age_clicked_{attempt}')
-        try:
-            page.wait_for_load_state('networkidle', timeout=timeout_ms)
-        except Exception:
-            pass
+            save_snapshot(page, run_dir, file_basename, f'age_clicked_{attempt}', verbose=verbose)
+            if _is_verified():
+                _log_debug('Page verification succeeded after clicking age buttons', run_dir, verbose)
+                return True
+        _wait_for_verification_signal(page, timeout_ms, deadline=deadline)
         if _is_verified():
             _log_debug('Page verification succeeded', run_dir, verbose)
             return True
-        time.sleep(1 * attempt)
+        if attempt < max_attempts:
+            # Capped exponential backoff with a little jitter so concurrent workers don't retry in lockstep
+            time.sleep(_time_left_ms(int((min(2 ** (attempt - 1), 4) + random.random() * 0.2) * 1000), deadline) / 1000)
     _log_debug('Page verification failed after attempts', run_dir, verbose)
+    # Always keep one snapshot of a failed verification for post-mortem, even on non-verbose runs
+    save_snapshot(page, run_dir, file_basename, 'verify_failed', verbose=True)
     return False
@@ -1,11 +1,12 @@
 
 
+import random
 import time
 
 from .headed_interaction_util import _log_debug
 
 
-def retry_with_backoff(func, recovery_fun, run_dir: str, verbose: bool, max_retries=3, backoff_factor=1):
+def retry_with_backoff(func, recovery_fun, run_dir: str, verbose: bool, max_retries=3, backoff_factor=1, errors: list = None, max_delay=30, deadline: float = None):
     """
     Retry a function with exponential backoff.
 
@@ -15,6 +16,9 @@ def retry_with_backoff(func, recovery_fun, run_dir: str, verbose: bool, max_retr
     :param verbose: Whether to log verbose messages.
     :param max_retries: Maximum number of retries before giving up.
     :param backoff_factor: Base factor for calculating backoff time (in seconds).
+    :param errors: Optional list that a summary dict of each failed attempt is appended to.
+    :param max_delay: Upper bound for the exponential part of the backoff (in seconds).
+    :param deadline: Optional `time.monotonic()` value after which no further attempt or recovery is started.
     :return: The result of the function if successful.
     :raises Exception: The last exception raised by the function after exhausting retries.
     """
@@ -24,8 +28,17 @@ def retry_with_backoff(func, recovery_fun, run_dir: str, verbose: bool, max_retr
             return func()
         except Exception as e:
             last_exception = e
-            sleep_time = backoff_factor * (2 ** (attempt - 1))
-            _log_debug(f"Attempt {attempt} failed with error: {e}. Retrying in {sleep_time} seconds...", run_dir=run_dir, exception=e, verbose=verbose)
+            # Capped exponential backoff plus up to 50% jitter, so parallel workers hitting the same gate don't retry in lockstep
+            base = min(backoff_factor * (2 ** (attempt - 1)), max_delay)
+            sleep_time = round(base + random.uniform(0, 0.5 * base), 2)
+            if errors is not None:
+                errors.append({'attempt': attempt, 'type': type(e).__name__, 'error': str(e), 'status': getattr(getattr(e, 'response', None), 'status', None)})
+            if deadline is not None and time.monotonic() + sleep_time >= deadline:
+                _log_debug("Attempt %d failed with error: %s. No time left for another attempt.", run_dir, verbose, attempt, e)
+                break
+            _log_debug("Attempt %d failed with error: %s. Retrying in %s seconds...", run_dir, verbose, attempt, e, sleep_time)
             time.sleep(sleep_time)
+            if deadline is not None and time.monotonic() >= deadline:
+                break
             recovery_fun(e)
     raise last_exception
\ No newline at end of file
@@ -18,12 +18,14 @@ def main():
     parser.add_argument('--datasets', nargs='*', help='Names of datasets to process (default: datasets 8-12)', default=[])
     parser.add_argument('--max-pages', type=int, help='Maximum number of pages to process per dataset (default: all)', default=None)
     parser.add_argument('--per-page-limit', type=int, help='Maximum number of files to download per page (default: all)', default=None)
+    parser.add_argument('--concurrency', type=int, help='Number of browser contexts downloading files in parallel (default: 4, use 1 for serial downloads)', default=4)
     parser.add_argument('--doj-section', type=str, help='Section of the DOJ site to target (default: doj-disclosures)', default='doj-disclosures')
     args = parser.parse_args()
     verbose = args.verbose
     max_pages = args.max_pages
     per_page_limit = args.per_page_limit
     doj_section = args.doj_section
+    concurrency = args.concurrency
     if args.datasets and len(args.datasets) > 0:
         datasets = args.datasets
     else:
@@ -51,6 +53,7 @@ def main():
             per_page_limit=per_page_limit, 
             timeout_ms=30000, 
             verbose=verbose, 
-            max_pages=max_pages)
+            max_pages=max_pages,
+            concurrency=concurrency)
 
 main()
\ No newline at end of file
@@ -1,13 +1,32 @@
 import time
 import os
+from contextlib import ExitStack
 from playwright.sync_api import Page
 import requests
 from typing import List
 
-from common_util.headed_interaction_util import _append_dead_letter, _log_debug, click_verification_controls, ensure_page_verified, print_request_details, save_snapshot
+from common_util.headed_interaction_util import _log_debug, block_heavy_resources, click_verification_controls, ensure_page_verified, print_request_details, save_snapshot
 from common_util import headed_interaction_util
 from .doj_dataset_next_page import navigate_to_next_page
-from .doj_file_helper import file_already_saved, pull_doj_file
+from .doj_file_helper import PlaywrightPool, file_already_saved, save_doj_file
+
+
+# Cookies/local storage of a verified context, kept next to the downloaded files so later runs can skip the age gate
+_STORAGE_STATE_FILE = '.playwright_state.json'
+# Saved state older than this is ignored, so the gate is passed afresh at least weekly. The file is only written by a
+# verification that did not start from it, so its mtime is the time the gate was actually passed.
+_STORAGE_STATE_TTL_S = 7 * 24 * 3600
+
+
+def _saved_storage_state(run_dir: str) -> str | None:
+    """Return the path of the storage state saved by an earlier run, or None if there is none or it has expired."""
+    state_path = os.path.join(os.path.dirname(run_dir), _STORAGE_STATE_FILE)
+    try:
+        if time.time() - os.path.getmtime(state_path) < _STORAGE_STATE_TTL_S:
+            return state_path
+    except OSError:
+        pass
+    return None
 
 
 def pull_doj_dataset_headed(playwright: Page,
@@ -17,7 +36,8 @@ def pull_doj_dataset_headed(playwright: Page,
         per_page_limit: int | None = None, 
         timeout_ms: int = 30000, 
         verbose: bool = False, 
-        max_pages: int | None = None):
+        max_pages: int | None = None,
+        concurrency: int = 4):
     
     """Navigate DOJ dataset pages and download files via headed browser.
 
@@ -25,6 +45,8 @@ def pull_doj_dataset_headed(playwright: Page,
     `per_page_limit` files from the item-list (or all items if no `per_page_limit` ). If a "Next page" link exists, click it and repeat.
 
     - `max_pages` (optional): stop after processing this many pages for the dataset. Use for short test runs.
+    - `concurrency` (optional): number of browser contexts downloading files of a page in parallel. They are started once per dataset and
+      reused for every page. Use 1 to download serially on the dataset page.
 
     This helper currently delegates single-file downloads to `pull_doj_file_headless`.
     """
@@ -33,120 +55,124 @@ def pull_doj_dataset_headed(playwright: Page,
     for path in datasets:
         ds_url = requests.compat.urljoin(base_url + '/', path)
         _log_debug(f"Starting dataset: {ds_url}", run_dir, verbose)
-        browser = playwright.chromium.launch(headless=False)
-        context = browser.new_context()
-        page = context.new_page()
-        page.on("request", print_request_details)
-
-        page.goto(ds_url, timeout=30000)
-        page.wait_for_load_state('networkidle', timeout=30000)
-        file_basename = (path.rstrip('/').split('/')[-1]) or 'dataset'
-        ts = time.strftime("%Y%m%d_%H%M%S")
-        save_snapshot(page, run_dir, file_basename, 'init', ts=ts)
-        _log_debug("Hello!!! This is a debug message to confirm that the logging system is working correctly.", run_dir, verbose)
-
-        try:
-            # Ensure page verification (bot/age) before scraping items
-            verified = ensure_page_verified(page, run_dir, file_basename, verbose, timeout_ms)
-            _log_debug(f"Page verification status: {verified}", run_dir, verbose)
-            if not verified:
-                _log_debug(f"Verification failed for dataset {ds_url}. Exiting. See logs and snapshots for details.", run_dir, verbose)
-                browser.close()
-                break
-
-            # page loop
-            page_number = 0
-            while True:
-                headed_interaction_util.schedule.run_pending()  # Run any pending scheduled tasks, including resetting the cleanup flag if needed
-                if headed_interaction_util.playwright_cleanup_scheduled:
-                    _log_debug("Performing scheduled Playwright cleanup to manage memory usage.", run_dir, verbose)
-                    context.storage_state(path=os.path.join(run_dir, f'context_storage_state_page_{page_number}.json'))
-                    current_url = page.url
-                    context.close()
-                    context = browser.new_context(storage_state=os.path.join(run_dir, f'context_storage_state_page_{page_number}.json'))
-                    page = context.new_page()
-                    page.on("request", print_request_details)
-                    page.goto(current_url, timeout=30000)
-                    page.wait_for_load_state('networkidle', timeout=30000)
-                    headed_interaction_util.playwright_cleanup_scheduled = False
-                page_number += 1
-                if max_pages is not None and page_number > max_pages:
-                    _log_debug(f"Reached max_pages ({max_pages}), stopping pagination for {path}", run_dir, verbose)
+        with ExitStack() as stack:
+            browser = playwright.chromium.launch(headless=False)
+            stack.callback(browser.close)  # Closes the browser, and with it every context and page, however this dataset ends
+            saved_state = _saved_storage_state(run_dir)
+            context = browser.new_context(storage_state=saved_state)
+            block_heavy_resources(context)
+            page = context.new_page()
+            page.on("request", print_request_details)
+
+            page.goto(ds_url, timeout=30000, wait_until='domcontentloaded')
+            file_basename = (path.rstrip('/').split('/')[-1]) or 'dataset'
+            ts = time.strftime("%Y%m%d_%H%M%S")
+            save_snapshot(page, run_dir, file_basename, 'init', ts=ts, verbose=verbose)
+            _log_debug("Hello!!! This is a debug message to confirm that the logging system is working correctly.", run_dir, verbose)
+
+            try:
+                # Ensure page verification (bot/age) before scraping items
+                verified = ensure_page_verified(page, run_dir, file_basename, verbose, timeout_ms)
+                _log_debug(f"Page verification status: {verified}", run_dir, verbose)
+                if not verified:
+                    _log_debug(f"Verification failed for dataset {ds_url}. Exiting. See logs and snapshots for details.", run_dir, verbose)
                     break
-                _log_debug(f"Processing page {page_number} for {path} (max {max_pages})", run_dir, verbose)
-                # collect item links
-                anchors = page.query_selector_all('.item-list a')
-                _log_debug(f"Found {len(anchors)} items on page", run_dir, verbose)
-                count = 0
-                for a in anchors:
-                    if per_page_limit is not None and count >= per_page_limit:
-                        _log_debug(f"Reached per_page_limit ({per_page_limit}), stopping processing for page {page_number} of {path}", run_dir, verbose)
-                        break
+                if saved_state is None:
                     try:
-                        href = a.get_attribute('href') or ''
-                        if not href:
-                            continue
-                        file_url = requests.compat.urljoin(page.url, href)
-                        _log_debug(f"Attempting file {file_url}", run_dir, verbose)
-                        if file_already_saved(file_url, run_dir):
-                            _log_debug(f"File already saved, skipping: {file_url}", run_dir, verbose)
-                            continue
-                        try:
-                            res = pull_doj_file(page, file_url, run_dir, timeout_ms=timeout_ms, verbose=verbose, retries=3)
-                        except Exception as e:
-                            _log_debug(f"Failed to fetch {file_url} after exhausting retry attempts.", run_dir, exception=e, verbose=verbose)
-                            _append_dead_letter(file_url, run_dir)
-                            continue
-
-                        if res is None:
-                            _log_debug(f"No result for file {file_url}, after exhausting retries.", run_dir, verbose)
-                            continue
+                        context.storage_state(path=os.path.join(os.path.dirname(run_dir), _STORAGE_STATE_FILE))
+                    except Exception as e:
+                        _log_debug("Could not save the verified storage state.", run_dir, verbose, exception=e)
 
-                        # Save content to file if available
-                        content = res.get('content')
-                        fname = res.get('filename')
-                        if content:
-                            out_dir = os.path.dirname(run_dir)  # Save files one level up from snapshots
-                            outpath = os.path.join(out_dir, fname)
-                            with open(outpath, 'wb') as wf:
-                                wf.write(content)
-                                _log_debug(f"Saved: {outpath} ({len(content)} bytes)", run_dir, verbose)
-                        else:
-                            _log_debug(f"No content found for file after exhausting retry attempts: {file_url}", run_dir, verbose)
-                        
-                        count += 1
+                # Download browsers are started once per dataset, after verification so they inherit its cookies
+                pool = None
+                if concurrency > 1:
+                    try:
+                        pool = stack.enter_context(PlaywrightPool(run_dir, ds_url, storage_state=context.storage_state(), concurrency=concurrency, timeout_ms=timeout_ms, verbose=verbose))
                     except Exception as e:
-                        _log_debug(f"Error downloading file {a} after exhausting retries. Skipping this file.", run_dir, exception=e, verbose=verbose)
-                        pass
+                        _log_debug(f"Could not start download pool for {ds_url}. Downloading serially.", run_dir, exception=e, verbose=verbose)
 
-                # After iterating all items, attempt to navigate to next page link
-                attempted_next_page_verification_controls = False
-                next_page_found = False
+                # page loop
+                page_number = 0
                 while True:
-                    next_page_found = navigate_to_next_page(
-                        page=page,
-                        page_number=page_number,
-                        file_basename=file_basename,
-                        run_dir=run_dir,
-                        verbose=verbose,
-                    timeout_ms=timeout_ms)
-
-                    if next_page_found:
-                        _log_debug(f"Next page found, navigating to page {page_number + 1} for {path}", run_dir=run_dir, verbose=verbose)
+                    headed_interaction_util.schedule.run_pending()  # Run any pending scheduled tasks, including resetting the cleanup flag if needed
+                    if headed_interaction_util.playwright_cleanup_scheduled:
+                        _log_debug("Performing scheduled Playwright cleanup to manage memory usage.", run_dir, verbose)
+                        context.storage_state(path=os.path.join(run_dir, f'context_storage_state_page_{page_number}.json'))
+                        current_url = page.url
+                        context.close()
+                        context = browser.new_context(storage_state=os.path.join(run_dir, f'context_storage_state_page_{page_number}.json'))
+                        block_heavy_resources(context)
+                        page = context.new_page()
+                        page.on("request", print_request_details)
+                        page.goto(current_url, timeout=30000, wait_until='domcontentloaded')
+                        headed_interaction_util.playwright_cleanup_scheduled = False
+                    page_number += 1
+                    if max_pages is not None and page_number > max_pages:
+                        _log_debug(f"Reached max_pages ({max_pages}), stopping pagination for {path}", run_dir, verbose)
+                        break
+                    _log_debug(f"Processing page {page_number} for {path} (max {max_pages})", run_dir, verbose)
+                    # collect item links
+                    # Read every item href in one round-trip instead of one get_attribute() call per anchor
+                    hrefs = page.eval_on_selector_all('.item-list a', "els => els.map(a => a.getAttribute('href') || '')")
+                    _log_debug("Found %d items on page", run_dir, verbose, len(hrefs))
+                    page_url = page.url
+                    file_urls = []
+                    for href in hrefs:
+                        if per_page_limit is not None and len(file_urls) >= per_page_limit:
+                            _log_debug(f"Reached per_page_limit ({per_page_limit}), stopping processing for page {page_number} of {path}", run_dir, verbose)
+                            break
+                        if not href:
+                            continue
+                        try:
+                            file_url = requests.compat.urljoin(page_url, href)
+                            if file_already_saved(file_url, run_dir):
+                                _log_debug("File already saved, skipping: %s", run_dir, verbose, file_url)
+                                continue
+                            file_urls.append(file_url)
+                        except Exception as e:
+                            _log_debug(f"Error reading file link {href}. Skipping this file.", run_dir, exception=e, verbose=verbose)
+                            pass
+
+                    if pool is not None:
+                        # Not joined here: the workers keep downloading while the next page is loaded
+                        for file_url in file_urls:
+                            pool.fetch(file_url)
+                    else:
+                        for file_url in file_urls:
+                            _log_debug("Attempting file %s", run_dir, verbose, file_url)
+                            try:
+                                save_doj_file(page, file_url, run_dir, timeout_ms=timeout_ms, verbose=verbose)
+                            except Exception as e:
+                                _log_debug(f"Error downloading file {file_url} after exhausting retries. Skipping this file.", run_dir, exception=e, verbose=verbose)
+                                pass
+
+                    # After iterating all items, attempt to navigate to next page link
+                    attempted_next_page_verification_controls = False
+                    next_page_found = False
+                    while True:
+                        next_page_found = navigate_to_next_page(
+                            page=page,
+                            page_number=page_number,
+                            file_basename=file_basename,
+                            run_dir=run_dir,
+                            verbose=verbose,
+                        timeout_ms=timeout_ms)
+
+                        if next_page_found:
+                            _log_debug(f"Next page found, navigating to page {page_number + 1} for {path}", run_dir=run_dir, verbose=verbose)
+                            break
+
+                        # if not next_page_found and not attempted_next_page_verification_controls:
+                        #     _log_debug('No next page found, attempting verification controls before concluding pagination.', run_dir=run_dir, verbose=verbose)
+                        #     click_verification_controls(page, run_dir=run_dir, file_basename=file_basename, verbose=verbose)
+                        #     attempted_next_page_verification_controls = True
+                        # else:
+                        _log_debug('No next page found after attempting verification controls, attempting to increment the page in the url instead.', run_dir=run_dir, verbose=verbose)
+                        direct_page_url = ds_url + '?page=' + str(page_number + 1)
+                        _log_debug(f"Attempting direct URL navigation to next page: {direct_page_url}", run_dir=run_dir, verbose=verbose)
+                        page.goto(direct_page_url, timeout=30000, wait_until='domcontentloaded')
                         break
 
-                    # if not next_page_found and not attempted_next_page_verification_controls:
-                    #     _log_debug('No next page found, attempting verification controls before concluding pagination.', run_dir=run_dir, verbose=verbose)
-                    #     click_verification_controls(page, run_dir=run_dir, file_basename=file_basename, verbose=verbose)
-                    #     attempted_next_page_verification_controls = True
-                    # else:
-                    _log_debug('No next page found after attempting verification controls, attempting to increment the page in the url instead.', run_dir=run_dir, verbose=verbose)
-                    direct_page_url = ds_url + '?page=' + str(page_number + 1)
-                    _log_debug(f"Attempting direct URL navigation to next page: {direct_page_url}", run_dir=run_dir, verbose=verbose)
-                    page.goto(direct_page_url, timeout=30000)
-                    break
-
-        except Exception as e:
-            _log_debug(f"Error processing dataset {ds_url}. Moving to next dataset.", run_dir=run_dir, exception=e, verbose=verbose)
+            except Exception as e:
+                _log_debug(f"Error processing dataset {ds_url}. Moving to next dataset.", run_dir=run_dir, exception=e, verbose=verbose)
 
-        browser.close()
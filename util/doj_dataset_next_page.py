@@ -1,11 +1,20 @@
 
 import time
 import playwright
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 import requests
 
 from common_util.headed_interaction_util import click_verification_controls, save_snapshot, _log_debug
 
 
+def _shows_block_page(page) -> bool:
+    # Search the markup in the browser so only the verdict crosses over, not a serialized copy of the whole page
+    return page.evaluate("""() => {
+        const html = document.documentElement.outerHTML.toLowerCase();
+        return html.includes('access denied') || html.includes('errors.edgesuite.net');
+    }""")
+
+
 def navigate_to_next_page(
         page: playwright.sync_api.Page,
         page_number: int,
@@ -16,23 +25,18 @@ def navigate_to_next_page(
         retries: int = 3):
     """Navigate to the next page URL with retries.
     """
-    save_snapshot(page, run_dir, file_basename, f'start_find_next_page_from_page_{page_number}', ts=time.strftime("%Y%m%d_%H%M%S"))
+    # One timestamp for every snapshot of this call; the event names keep them apart
+    ts = time.strftime("%Y%m%d_%H%M%S")
+    save_snapshot(page, run_dir, file_basename, f'start_find_next_page_from_page_{page_number}', ts=ts, verbose=verbose)
     next_link = None
     try:
         cand = page.query_selector("a.usa-pagination__next-page")
         if cand:
             next_link = cand
         else:
-            # look for 'Next' text anchors
-            links = page.query_selector_all('a')
-            for l in links:
-                try:
-                    txt = (l.inner_text() or '').strip().lower()
-                except Exception:
-                    txt = ''
-                if txt.startswith('next') or 'next' == txt:
-                    next_link = l
-                    break
+            # look for 'Next' text anchors, testing every link's text in the browser and getting back only the match
+            next_link = page.evaluate_handle("""() => Array.from(document.querySelectorAll('a'))
+                .find(l => (l.innerText || '').trim().toLowerCase().startsWith('next')) || null""").as_element()
     except Exception as e:
         _log_debug("Error locating next page link. Exception " + str(e), run_dir, verbose)
         pass
@@ -55,31 +59,32 @@ def navigate_to_next_page(
                 full_next = requests.compat.urljoin(page.url, href)
                 _log_debug(f"Attempting navigation to next page URL: full_next={full_next} - page.url={page.url} - href={href}", run_dir, verbose)
                 try:
-                    resp = page.goto(full_next, timeout=30000)
+                    resp = page.goto(full_next, timeout=30000, wait_until='domcontentloaded')
                     try:
                         _log_debug(f"Next page navigation status: {getattr(resp, 'status', 'unknown')}", run_dir, verbose)
                         return True
                     except Exception:
                         _log_debug("Error getting status from next page response: " + str(e), run_dir, verbose)
                         pass
-                    page.wait_for_load_state('networkidle', timeout=timeout_ms)
                 except Exception as e:
                         _log_debug(f"Direct goto to next page failed. falling back to click", run_dir, exception=e, verbose=verbose)
                 try:
-                    next_link.click()
-                    page.wait_for_load_state('networkidle', timeout=timeout_ms)
+                    with page.expect_navigation(wait_until='domcontentloaded', timeout=timeout_ms):
+                        next_link.click()
                 except Exception as e2:
                     _log_debug(f"Click fallback failed.", run_dir, exception=e2, verbose=verbose)
                     pass
             else:
-                next_link.click()
-                page.wait_for_load_state('networkidle', timeout=timeout_ms)
+                try:
+                    with page.expect_navigation(wait_until='domcontentloaded', timeout=timeout_ms):
+                        next_link.click()
+                except PlaywrightTimeoutError:
+                    # The click updated the page in place instead of navigating; carry on once the DOM has loaded
+                    page.wait_for_load_state('domcontentloaded', timeout=timeout_ms)
 
-                ts = time.strftime("%Y%m%d_%H%M%S")
-                save_snapshot(page, run_dir, file_basename, f'page_{page_number+1}', ts=ts)
+                save_snapshot(page, run_dir, file_basename, f'page_{page_number+1}', ts=ts, verbose=verbose)
 
                 # Detect Access Denied / WAF blocks
-                page_content = (page.content() or '').lower()
                 blocked = False
                 # if 'access denied' in page_content or 'errors.edgesuite.net' in page_content:
                 #     blocked = True
@@ -89,7 +94,8 @@ def navigate_to_next_page(
                 if blocked:
                     _log_debug(f"Detected WAF/Access Denied on page {page_number+1} (url={full_next})", run_dir, verbose)
                 try:
-                    click_verification_controls(page, run_dir, file_basename)
+                    # A dataset page that got through shows its file list
+                    click_verification_controls(page, run_dir, file_basename, verbose, post_click_selector='.item-list')
                 except Exception as e:
                     _log_debug(f"Failed to verify page after WAF detection", run_dir, exception=e, verbose=verbose)
                     pass
@@ -98,28 +104,21 @@ def navigate_to_next_page(
                 try:
                     if full_next:
                         _log_debug(f"Retrying direct goto to next page URL: {full_next}", run_dir, verbose)
-                        resp2 = page.goto(full_next, timeout=30000)
+                        resp2 = page.goto(full_next, timeout=30000, wait_until='domcontentloaded')
                         try:
                             _log_debug(f"Retry status: {getattr(resp2, 'status', 'unknown')}", run_dir, verbose)
                         except Exception as e:
                             _log_debug(f"Failed to get status from retry response: {resp2}", run_dir, exception=e, verbose=verbose)
                             pass
-                        page.wait_for_load_state('networkidle', timeout=timeout_ms)
-                        ts2 = time.strftime("%Y%m%d_%H%M%S")
-                        save_snapshot(page, run_dir, file_basename, f'page_{page_number+1}_retry', ts=ts2)
-                        page_content2 = (page.content() or '').lower()
-                        if 'access denied' in page_content2 or \
-                            'errors.edgesuite.net' in page_content2 or \
+                        save_snapshot(page, run_dir, file_basename, f'page_{page_number+1}_retry', ts=ts, verbose=verbose)
+                        if _shows_block_page(page) or \
                             (resp2 and getattr(resp2, 'status', None) in (401,403,451,503)):
                             _log_debug('Still blocked after retry; stopping pagination for this dataset', run_dir, verbose)
                             return False
                         else:
-                            page.reload()
-                            page.wait_for_load_state('networkidle', timeout=timeout_ms)
-                            ts2 = time.strftime("%Y%m%d_%H%M%S")
-                            save_snapshot(page, run_dir, file_basename, f'page_{page_number+1}_retry', ts=ts2)
-                            page_content2 = (page.content() or '').lower()
-                            if 'access denied' in page_content2 or 'errors.edgesuite.net' in page_content2:
+                            page.reload(timeout=timeout_ms, wait_until='domcontentloaded')
+                            save_snapshot(page, run_dir, file_basename, f'page_{page_number+1}_retry_reload', ts=ts, verbose=verbose)
+                            if _shows_block_page(page):
                                 _log_debug('Still blocked after retry; stopping pagination for this dataset', run_dir, verbose)
                                 return False
                 except Exception as e:
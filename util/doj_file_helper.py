@@ -1,10 +1,44 @@
+import hashlib
+import json
 import os
-from playwright.sync_api import Page
+import queue
+import threading
+import time
+from contextlib import ExitStack
+from urllib.parse import urlsplit
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError, sync_playwright
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from common_util.retry_helper import retry_with_backoff
-from common_util.headed_interaction_util import TryGetRequestException, _log_debug, _try_get_request, click_verification_controls, click_age_buttons
+from common_util import headed_interaction_util
+from common_util.headed_interaction_util import TryGetRequestException, _append_dead_letter, _append_failure_diagnostics, _log_debug, block_heavy_resources, _try_get_request, click_verification_controls, click_age_buttons, ensure_page_verified
 
-def handle_file_fetch_failure(page: Page, file_url: str, exception: TryGetRequestException, run_dir: str, verbose: bool):
+# Pooled HTTP session for the direct-download fast path, shared by the download pool's worker threads. It retries
+# once, briefly and without honouring Retry-After, since the browser path is always there to fall back to.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=Retry(total=1, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504], respect_retry_after_header=False)))
+# Pool workers recycle their browser context this often (the main thread's scheduled cleanup interval) to bound memory
+_POOL_CONTEXT_RECYCLE_S = 60
+_gated_hosts = set() # hosts that answered with a gate page, 401/403 or kept failing; the fast path is not tried for them again
+
+def file_basename_from_url(file_url: str) -> str:
+    """Return the file name a URL is saved under, ignoring any query string or fragment."""
+    return urlsplit(file_url).path.rsplit('/', 1)[-1] or f"download_{time.strftime('%Y%m%d_%H%M%S')}.pdf"
+
+def open_verified_page(page: Page, verify_url: str, run_dir: str, verbose: bool, timeout_ms: int = 30000, deadline: float | None = None) -> bool:
+    """Load `verify_url` in `page` and pass its age/bot verification.
+
+    Pages of the download pool start out blank; this gives them a real DOJ page for the verification helpers to act on.
+    Returns whether verification succeeded. With a `deadline` (a `time.monotonic()` value) nothing runs past it.
+    """
+    if deadline is not None and time.monotonic() >= deadline:
+        return False
+    page.goto(verify_url, timeout=timeout_ms, wait_until='domcontentloaded')
+    return ensure_page_verified(page, run_dir, 'pool_verify', verbose, timeout_ms, deadline=deadline)
+
+def handle_file_fetch_failure(page: Page, file_url: str, exception: TryGetRequestException, run_dir: str, verbose: bool, verify_url: str | None = None, timeout_ms: int = 30000, deadline: float | None = None):
     _log_debug(f"Handling file fetch failure for {file_url}. Exception: {exception}", exception=exception, run_dir=run_dir, verbose=verbose) 
     if not isinstance(exception, TryGetRequestException):
         _log_debug(f"Unexpected exception type: {type(exception)}", exception=exception, run_dir=run_dir, verbose=verbose)
@@ -17,53 +51,388 @@ def handle_file_fetch_failure(page: Page, file_url: str, exception: TryGetReques
                 raise exception  # re-raise to stop retries
             else:
                 _log_debug(f"Non-404 failure, will attempt verification controls before next retry.", run_dir=run_dir, verbose=verbose)
-                file_basename = os.path.basename(file_url.split('?')[0])
-                click_verification_controls(page, run_dir=run_dir, file_basename=file_basename, verbose=verbose)
-                click_age_buttons(page, run_dir=run_dir, file_basename=file_basename, verbose=verbose)
+                if verify_url:
+                    open_verified_page(page, verify_url, run_dir, verbose, timeout_ms=timeout_ms, deadline=deadline)
+                    return
+                file_basename = file_basename_from_url(file_url)
+                click_verification_controls(page, run_dir=run_dir, file_basename=file_basename, verbose=verbose, timeout_ms=timeout_ms, deadline=deadline)
+                click_age_buttons(page, run_dir=run_dir, file_basename=file_basename, verbose=verbose, timeout_ms=timeout_ms, deadline=deadline)
+
+def click_verification_controls_expecting_download(page: Page, run_dir: str, file_basename: str, verbose: bool, timeout_ms: int = 30000, deadline: float | None = None):
+    """Click verification controls and age buttons, capturing a download if one of the clicks starts it.
+
+    Returns the Playwright `Download` or None if no download event arrived.
+    """
+    downloads = []
+    def _on_download(download):
+        downloads.append(download)
+    page.on('download', _on_download)
+    try:
+        clicked = click_verification_controls(page, run_dir=run_dir, file_basename=file_basename, verbose=verbose, timeout_ms=timeout_ms, deadline=deadline)
+        clicked = click_age_buttons(page, run_dir=run_dir, file_basename=file_basename, verbose=verbose, timeout_ms=timeout_ms, deadline=deadline) or clicked
+        if clicked and not downloads:
+            # Give a click-initiated download a brief moment to start, but don't wait on clicks that never download
+            try:
+                downloads.append(page.wait_for_event('download', timeout=min(timeout_ms, 2000)))
+            except PlaywrightTimeoutError:
+                pass
+    finally:
+        page.remove_listener('download', _on_download)
+    return downloads[0] if downloads else None
+
+def _url_cache_path(file_url: str, out_dir: str) -> str:
+    return os.path.join(out_dir, '.url_cache', hashlib.sha1(file_url.encode('utf-8')).hexdigest() + '.json')
+
+def _sha256_of_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def record_saved_file(file_url: str, outpath: str, content: bytes | None, headers: dict, run_dir: str, verbose: bool = False):
+    """Record the size and digest of a saved file in the on-disk URL cache next to the downloaded files.
+
+    Pass `content=None` for files that were streamed to disk; they are then hashed from `outpath` in chunks.
+    """
+    entry = {
+        'url': file_url,
+        'filename': os.path.basename(outpath),
+        'size': len(content) if content is not None else os.path.getsize(outpath),
+        'sha256': hashlib.sha256(content).hexdigest() if content is not None else _sha256_of_file(outpath),
+        'etag': headers.get('etag'),
+        'last_modified': headers.get('last-modified'),
+    }
+    cache_path = _url_cache_path(file_url, os.path.dirname(outpath))
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as cf:
+            json.dump(entry, cf)
+    except Exception as e:
+        _log_debug(f"Failed to update URL cache for {file_url}.", run_dir, exception=e, verbose=verbose)
 
 def file_already_saved(file_url: str, run_dir: str) -> bool:
-    file_name = file_url.rsplit('/', 1)[-1]
+    """Check whether `file_url` was already downloaded, using only a stat and the URL cache entry (no network).
+
+    Files saved before the URL cache existed have no entry and are trusted as is; files whose size no longer
+    matches their cache entry (e.g. truncated or replaced) are downloaded again.
+    """
+    file_name = file_basename_from_url(file_url)
     out_dir = os.path.dirname(run_dir) # files are saved in the parent directory of run_dir
     outpath = os.path.join(out_dir, file_name)
-    return os.path.exists(outpath)                
+    try:
+        size = os.stat(outpath).st_size
+    except OSError:
+        return False
+    try:
+        with open(_url_cache_path(file_url, out_dir), 'r', encoding='utf-8') as cf:
+            entry = json.load(cf)
+    except (OSError, ValueError):
+        return True
+    return entry.get('size') == size
+
+def _is_html_response(resp) -> bool:
+    """Tell an HTML (verification/gate) page from a file by its content-type.
+
+    Only when the header is missing is the start of the body sniffed for an HTML tag.
+    """
+    content_type = (resp.headers.get('content-type') or '').lower()
+    if content_type:
+        return 'text/html' in content_type
+    head = resp.body()[:512].lstrip().lower()
+    return head.startswith(b'<!doctype html') or b'<html' in head
+
+def _fetch_direct_pdf(page: Page, file_url: str, run_dir: str, timeout_ms: int, verbose: bool, deadline: float | None = None):
+    """Try to download a .pdf URL over plain HTTP with the browser context's cookies, without driving the page.
+
+    The body is streamed to a .part file next to its destination. Returns a pull_doj_file result with 'path', or None
+    to fall back to the browser, in which case no .part file is left behind. Hosts that answer with a gate page or
+    401/403, or give no response once the retry is used up, are remembered so later files skip the attempt. A 404 is final for the file and raised as a RuntimeError.
+    Streaming stops at `deadline` (a `time.monotonic()` value), if given.
+    """
+    host = urlsplit(file_url).netloc
+    if host in _gated_hosts or not urlsplit(file_url).path.lower().endswith('.pdf'):
+        return None
+    file_basename = file_basename_from_url(file_url)
+    try:
+        cookies = {c['name']: c['value'] for c in page.context.cookies(file_url)}
+    except Exception as e:
+        _log_debug(f"Could not read cookies for {file_url}, falling back to the browser.", run_dir, exception=e, verbose=verbose)
+        return None
+    try:
+        resp = _SESSION.get(file_url, cookies=cookies, stream=True, timeout=timeout_ms / 1000)
+    except requests.RequestException as e:
+        # No response at all, even after the session's retry: don't keep paying for it on every file of this host
+        _log_debug(f"Direct fetch of {file_url} failed, using the browser for {host} from now on.", run_dir, exception=e, verbose=verbose)
+        _gated_hosts.add(host)
+        return None
+    partpath = None
+    try:
+        with resp:
+            status = resp.status_code
+            content_type = (resp.headers.get('content-type') or '').lower()
+            if status != 200 or 'application/pdf' not in content_type:
+                _log_debug("Direct fetch of %s returned %s (%s)", run_dir, verbose, file_url, status, content_type)
+                if status in (401, 403) or (status == 200 and 'text/html' in content_type):
+                    _log_debug("Using the browser for %s from now on", run_dir, verbose, host)
+                    _gated_hosts.add(host)
+                if status != 404:
+                    return None
+            else:
+                partpath = os.path.join(os.path.dirname(run_dir), file_basename + '.part')
+                with open(partpath, 'wb') as pf:
+                    for chunk in resp.iter_content(chunk_size=1 << 20):
+                        if deadline is not None and time.monotonic() > deadline:
+                            raise PlaywrightTimeoutError(f"Time budget exhausted while streaming {file_url}")
+                        pf.write(chunk)
+                headers = {k.lower(): v for k, v in resp.headers.items()}
+    except Exception as e:
+        # Errors while streaming the body (e.g. a dropped connection) only affect this file, the host stays eligible
+        _log_debug(f"Direct fetch of {file_url} failed, falling back to the browser.", run_dir, exception=e, verbose=verbose)
+        if partpath:
+            try:
+                os.remove(partpath)
+            except OSError:
+                pass
+        return None
+    if status == 404:
+        _log_debug(f"File not found (404) for URL: {file_url}. File was removed or inaccessible.", run_dir=run_dir, verbose=verbose)
+        raise RuntimeError(f"File not found (404) for URL: {file_url}")
+    _log_debug(f"Direct fetch succeeded for {file_url}: {file_basename} ({os.path.getsize(partpath)} bytes)", run_dir=run_dir, verbose=verbose)
+    return {'path': partpath, 'filename': file_basename, 'headers': headers}
 
-"""Download a single DOJ file using Playwright page provided."""
 def pull_doj_file(page: Page, 
         file_url: str, 
         run_dir: str, 
         timeout_ms: int = 30000, 
         verbose: bool = False, 
-        retries: int = 3):
+        retries: int = 3,
+        budget_ms: int = 120000,
+        verify_url: str | None = None):
+    """Download a single DOJ file using the Playwright page provided.
+
+    `verify_url` is given when `page` is not itself a dataset page (the download pool's pages): the page is then
+    sent there to pass verification again whenever the file request comes back with a gate.
+    """
 
     # Retry loop with verification controls if needed
     verification_controls_attempted = False # Track if we've tried verification controls yet
-    while (True):
-        resp = retry_with_backoff(
-            func=lambda: 
-                _try_get_request(page, file_url, run_dir, verbose, timeout_ms=timeout_ms), 
-            recovery_fun=lambda e: 
-                handle_file_fetch_failure(page, file_url, e, run_dir, verbose),
-        run_dir=run_dir, 
-        verbose=verbose,
-        max_retries=retries)
-        
-        file_basename = os.path.basename(file_url.split('?')[0])
-
-        if getattr(resp, 'status', None) != 200 and verification_controls_attempted:
-            _log_debug(f"Retry attempts exhausted for {file_url} with status {getattr(resp, 'status', 'unknown')} after attempting verification controls.", run_dir=run_dir, verbose=verbose) 
-            raise RuntimeError(f"Failed to fetch {file_url} after retries and verification control attempt.")
-        else:
-            if "text/html" not in resp.headers.get('content-type'):
-                content = resp.body()
-                headers = resp.headers
-                filename = os.path.basename(file_url.split('?')[0])
-                _log_debug(f"Fetch succeeded for {file_url}: {filename} ({len(content)} bytes)", run_dir=run_dir, verbose=verbose)
-                return {'content': content, 'filename': filename, 'headers': headers}
-            elif not verification_controls_attempted:
-                _log_debug(f"Attempting verification controls for {file_url}", run_dir=run_dir, verbose=verbose)
-                click_verification_controls(page, run_dir=run_dir, file_basename=file_basename, verbose=verbose)
-                click_age_buttons(page, run_dir=run_dir, file_basename=file_basename, verbose=verbose)
-                verification_controls_attempted = True
+    # Overall time budget for this file. Every request and verification step gets at most what is left of it, and no
+    # retry or recovery is started after it, so a URL that never resolves can't hold a worker for the sum of every
+    # per-call timeout.
+    deadline = time.monotonic() + budget_ms / 1000
+
+    def _remaining_ms() -> int:
+        remaining = int((deadline - time.monotonic()) * 1000)
+        if remaining <= 0:
+            raise PlaywrightTimeoutError(f"Time budget of {budget_ms} ms exhausted for {file_url}")
+        return min(timeout_ms, remaining)
+
+    file_basename = file_basename_from_url(file_url)
+    errors = [] # Summary of every failed attempt, written once as a single diagnostics record if the file fails
+    try:
+        direct = _fetch_direct_pdf(page, file_url, run_dir, _remaining_ms(), verbose, deadline=deadline)
+        if direct is not None:
+            return direct
+        while (True):
+            resp = retry_with_backoff(
+                func=lambda: 
+                    _try_get_request(page, file_url, run_dir, verbose, timeout_ms=_remaining_ms()), 
+                recovery_fun=lambda e: 
+                    handle_file_fetch_failure(page, file_url, e, run_dir, verbose, verify_url=verify_url, timeout_ms=_remaining_ms(), deadline=deadline),
+            run_dir=run_dir, 
+            verbose=verbose,
+            max_retries=retries,
+            errors=errors,
+            deadline=deadline)
+
+            if getattr(resp, 'status', None) != 200 and verification_controls_attempted:
+                _log_debug(f"Retry attempts exhausted for {file_url} with status {getattr(resp, 'status', 'unknown')} after attempting verification controls.", run_dir=run_dir, verbose=verbose) 
+                raise RuntimeError(f"Failed to fetch {file_url} after retries and verification control attempt.")
             else:
-                _log_debug(f"Unexpected content-type for {file_url}: {resp.headers.get('content-type')}.", run_dir=run_dir, verbose=verbose)
-                raise RuntimeError(f"Unexpected content-type for {file_url}: {resp.headers.get('content-type')}.")
\ No newline at end of file
+                if not _is_html_response(resp):
+                    content = resp.body()
+                    headers = resp.headers
+                    _log_debug(f"Fetch succeeded for {file_url}: {file_basename} ({len(content)} bytes)", run_dir=run_dir, verbose=verbose)
+                    return {'content': content, 'filename': file_basename, 'headers': headers}
+                elif not verification_controls_attempted:
+                    _log_debug(f"Attempting verification controls for {file_url}", run_dir=run_dir, verbose=verbose)
+                    if verify_url:
+                        open_verified_page(page, verify_url, run_dir, verbose, timeout_ms=_remaining_ms(), deadline=deadline)
+                    download = click_verification_controls_expecting_download(page, run_dir, file_basename, verbose, timeout_ms=_remaining_ms(), deadline=deadline)
+                    verification_controls_attempted = True
+                    if download is not None:
+                        # The browser already downloaded the file; copy it next to its destination instead of
+                        # re-fetching the URL or reading it into memory
+                        partpath = os.path.join(os.path.dirname(run_dir), file_basename + '.part')
+                        download.save_as(partpath)
+                        _log_debug(f"Download captured for {file_url}: {file_basename} ({os.path.getsize(partpath)} bytes)", run_dir=run_dir, verbose=verbose)
+                        return {'path': partpath, 'filename': file_basename, 'headers': {}}
+                else:
+                    _log_debug(f"Unexpected content-type for {file_url}: {resp.headers.get('content-type')}.", run_dir=run_dir, verbose=verbose)
+                    raise RuntimeError(f"Unexpected content-type for {file_url}: {resp.headers.get('content-type')}.")
+    except Exception as e:
+        _append_failure_diagnostics(file_url, run_dir, errors, exception=e)
+        raise
+
+
+def save_doj_file(page: Page,
+        file_url: str,
+        run_dir: str,
+        timeout_ms: int = 30000,
+        verbose: bool = False,
+        verify_url: str | None = None) -> bool:
+    """Pull a single file and write it one level up from `run_dir`.
+
+    Failures are written to the dead letter file. Returns True if the file was processed, False otherwise.
+    """
+    try:
+        res = pull_doj_file(page, file_url, run_dir, timeout_ms=timeout_ms, verbose=verbose, retries=3, verify_url=verify_url)
+    except Exception as e:
+        _log_debug(f"Failed to fetch {file_url} after exhausting retry attempts: {e!r}. See failure_diagnostics.jsonl for details.", run_dir, verbose=verbose)
+        _append_dead_letter(file_url, run_dir)
+        return False
+
+    if res is None:
+        _log_debug(f"No result for file {file_url}, after exhausting retries.", run_dir, verbose)
+        return False
+
+    # Save content to file if available. Files are written under a .part name and renamed into place, so an
+    # interrupted run never leaves a truncated file that file_already_saved would take for a finished one.
+    content = res.get('content')
+    partpath = res.get('path')
+    fname = res.get('filename')
+    out_dir = os.path.dirname(run_dir)  # Save files one level up from snapshots
+    outpath = os.path.join(out_dir, fname)
+    if partpath:
+        os.replace(partpath, outpath)
+        _log_debug(f"Saved: {outpath} ({os.path.getsize(outpath)} bytes)", run_dir, verbose)
+        record_saved_file(file_url, outpath, None, res.get('headers') or {}, run_dir, verbose)
+    elif content:
+        partpath = outpath + '.part'
+        with open(partpath, 'wb') as wf:
+            wf.write(content)
+        os.replace(partpath, outpath)
+        _log_debug(f"Saved: {outpath} ({len(content)} bytes)", run_dir, verbose)
+        record_saved_file(file_url, outpath, content, res.get('headers') or {}, run_dir, verbose)
+    else:
+        _log_debug(f"No content found for file after exhausting retry attempts: {file_url}", run_dir, verbose)
+    return True
+
+
+class PlaywrightPool:
+    """Worker threads that each keep one browser and context alive for the whole run.
+
+    Playwright's sync API is bound to the thread that started it, so each worker runs its own
+    `sync_playwright()` instance with a single browser context seeded from `storage_state` (the cookies
+    of an already verified page). Each worker's page is sent to `verify_url` (the dataset page) and
+    verified at start-up, so verification clicks after a gated file response act on a real page, and
+    the context is recycled on the same schedule as the dataset page's to bound memory.
+
+    Workers start once in `__enter__` and take URLs from a shared queue until the pool exits, so the
+    browser launch and the age-gate cookies are paid for once per run rather than once per page of
+    files. The queue is bounded, so callers can keep producing URLs while earlier ones download
+    without holding more than a couple of pending URLs per worker.
+
+        with PlaywrightPool(run_dir, ds_url, storage_state=context.storage_state()) as pool:
+            for file_url in file_urls:
+                pool.fetch(file_url)
+        # every queued URL has been processed once the pool has exited
+    """
+
+    def __init__(self, run_dir: str, verify_url: str, storage_state: dict | None = None, concurrency: int = 4, timeout_ms: int = 30000, verbose: bool = False):
+        self.run_dir = run_dir
+        self.verify_url = verify_url
+        self.storage_state = storage_state
+        self.concurrency = max(1, concurrency)
+        self.timeout_ms = timeout_ms
+        self.verbose = verbose
+        # Bounded so that `fetch` blocks once every worker has a backlog, instead of the page loop racing ahead
+        self._work = queue.Queue(maxsize=self.concurrency * 2)
+        self._threads = []
+
+    def __enter__(self):
+        started = []
+        ready = threading.Barrier(self.concurrency + 1)
+        for _ in range(self.concurrency):
+            t = threading.Thread(target=self._worker, args=(ready, started), daemon=True)
+            t.start()
+            self._threads.append(t)
+        ready.wait()
+        if not started:
+            self.__exit__(None, None, None)
+            raise RuntimeError("No browser could be started for the download pool")
+        _log_debug("Started download pool with %d of %d browser contexts", self.run_dir, self.verbose, len(started), self.concurrency)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for _ in self._threads:
+            self._work.put(None)
+        for t in self._threads:
+            t.join()
+        self._threads = []
+        return False
+
+    def fetch(self, file_url: str):
+        """Queue `file_url` for download by the next free worker, waiting while the queue is full."""
+        self._work.put(file_url)
+
+    def _open_context(self, browser, storage_state):
+        # A page that fails to load or verify is still handed out: files re-verify it on demand through `verify_url`
+        context = browser.new_context(storage_state=storage_state)
+        try:
+            block_heavy_resources(context)
+            page = context.new_page()
+        except Exception:
+            context.close()
+            raise
+        try:
+            verified = open_verified_page(page, self.verify_url, self.run_dir, self.verbose, self.timeout_ms)
+        except Exception as e:
+            _log_debug("Download pool page failed to load %s", self.run_dir, self.verbose, self.verify_url, exception=e)
+            verified = False
+        if not verified:
+            _log_debug("Download pool page failed verification at %s; files will retry it on demand", self.run_dir, self.verbose, self.verify_url)
+        return context, page
+
+    def _worker(self, ready, started):
+        with ExitStack() as stack:
+            try:
+                playwright = stack.enter_context(sync_playwright())
+                browser = playwright.chromium.launch(headless=False)
+                stack.callback(browser.close)
+                context, page = self._open_context(browser, self.storage_state)
+                context_started = time.monotonic()
+                started.append(page)
+            except Exception as e:
+                _log_debug("Failed to start a download pool browser", self.run_dir, self.verbose, exception=e)
+                return
+            finally:
+                ready.wait()
+            while True:
+                file_url = self._work.get()
+                try:
+                    if file_url is None:
+                        return
+                    # Same memory cleanup as the dataset page's context: carry the cookies over into a fresh context
+                    if headed_interaction_util.playwright_cleanup_scheduled or time.monotonic() - context_started >= _POOL_CONTEXT_RECYCLE_S:
+                        _log_debug("Recycling download pool browser context to manage memory usage.", self.run_dir, self.verbose)
+                        context_started = time.monotonic()
+                        # The new context is swapped in only once it exists, so a failure keeps the old one usable
+                        try:
+                            new_context, new_page = self._open_context(browser, context.storage_state())
+                        except Exception as e:
+                            _log_debug("Failed to recycle download pool browser context, keeping the current one.", self.run_dir, self.verbose, exception=e)
+                        else:
+                            old_context, context, page = context, new_context, new_page
+                            try:
+                                old_context.close()
+                            except Exception as e:
+                                _log_debug("Failed to close the recycled download pool browser context.", self.run_dir, self.verbose, exception=e)
+                    _log_debug("Attempting file %s", self.run_dir, self.verbose, file_url)
+                    save_doj_file(page, file_url, self.run_dir, timeout_ms=self.timeout_ms, verbose=self.verbose, verify_url=self.verify_url)
+                except Exception as e:
+                    _log_debug(f"Error downloading file {file_url}. Skipping this file.", self.run_dir, exception=e, verbose=self.verbose)
+                finally:
+                    self._work.task_done()
+